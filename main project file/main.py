@@ -1,510 +1,768 @@
-import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import plotly.express as px
-import plotly.graph_objects as go
-import pyttsx3
-from io import BytesIO
-import time
-import smtplib
-import numpy as np
-
-
-
-# App configuration
-st.set_page_config(
-    page_title="Spacecraft Telemetry Analyzer",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Custom styling
-st.markdown(
-    """
-    <style>
-    .stApp { background-color: #0f1117; color: white; }
-    .stButton>button { background-color: #1f77b4; color: white; }
-    .stDownloadButton>button { background-color: #2ca02c; color: white; }
-    .stTabs [data-baseweb="tab-list"] button [data-testid="stMarkdownContainer"] p {
-        font-size: 1.2rem;
-        font-weight: bold;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True
-)
-
-# App header
-st.title("🛰️ Universal Spacecraft Telemetry Analyzer")
-st.markdown("Advanced analytics platform for spacecraft telemetry data with real-time anomaly detection")
-
-# Define telemetry fields and their properties
-telemetry_fields = {
-    "temperature": {
-        "label": "Temperature",
-        "y_label": "°C",
-        "thresholds": {"low": 0, "high": 40},
-        "alert_msg": lambda val: f"{'Low' if val < 0 else 'High'} temperature detected: {val}°C"
-    },
-    "pressure": {
-        "label": "Pressure",
-        "y_label": "atm",
-        "thresholds": {"low": 0.8, "high": 1.2},
-        "alert_msg": lambda val: f"{'Low' if val < 0.8 else 'High'} pressure detected: {val} atm"
-    },
-    "velocity": {
-        "label": "Velocity",
-        "y_label": "m/s",
-        "thresholds": {"low": None, "high": None},
-        "alert_msg": None
-    },
-    "battery": {
-        "label": "Battery Level",
-        "y_label": "%",
-        "thresholds": {"low": 20, "high": None},
-        "alert_msg": lambda val: f"Battery critically low: {val}%"
-    },
-    "fuel": {
-        "label": "Fuel Level",
-        "y_label": "%",
-        "thresholds": {"low": 20, "high": None},
-        "alert_msg": lambda val: f"Fuel critically low: {val}%"
-    }
-}
-
-# TTS for alerts
-def speak_alerts(alerts):
-    try:
-        engine = pyttsx3.init()
-        for msg in alerts:
-            st.info(f"🔊 {msg}")
-            engine.say(msg)
-            engine.runAndWait()
-            time.sleep(1)
-    except Exception as e:
-        st.error(f"❌ Audio alert error: {e}")
-
-# Highlight cells in dataframe based on thresholds
-def highlight_cell(val, col):
-    if col in telemetry_fields:
-        thresholds = telemetry_fields[col]["thresholds"]
-        try:
-            if thresholds["low"] is not None and val < thresholds["low"]:
-                return 'color: red; background-color: rgba(255, 0, 0, 0.1)'
-            if thresholds["high"] is not None and val > thresholds["high"]:
-                return 'color: red; background-color: rgba(255, 0, 0, 0.1)'
-            # Normal values in green
-            return 'color: green'
-        except:
-            pass
-    return ''
-
-def style_dataframe(df):
-    return df.style.apply(
-        lambda row: [highlight_cell(row[col], col) if col in telemetry_fields and col in df.columns else '' 
-                    for col in df.columns],
-        axis=1
-    )
-
-# Check for anomalies in the data
-def detect_anomalies(df):
-    alerts = []
-    
-    for col, meta in telemetry_fields.items():
-        if col in df.columns and meta["alert_msg"] is not None:
-            thresholds = meta["thresholds"]
-            
-            if thresholds["low"] is not None and (df[col] < thresholds["low"]).any():
-                min_val = df[col].min()
-                alerts.append(meta["alert_msg"](min_val))
-                
-            if thresholds["high"] is not None and (df[col] > thresholds["high"]).any():
-                max_val = df[col].max()
-                alerts.append(meta["alert_msg"](max_val))
-                
-    return alerts
-
-# Generate 2D plots for each telemetry field
-def create_2d_plots(df):
-    tabs = st.tabs([meta["label"] for meta in telemetry_fields.values()])
-    
-    for idx, (col, meta) in enumerate(telemetry_fields.items()):
-        if col in df.columns:
-            with tabs[idx]:
-                st.subheader(f"{meta['label']} Over Time")
-                
-                # Create the plot
-                fig, ax = plt.subplots(figsize=(10, 5))
-                x = df["timestamp"] if "timestamp" in df.columns else df.index
-                ax.plot(x, df[col], color='cyan', marker='o')
-                ax.set_ylabel(meta["y_label"])
-                ax.grid(True)
-                
-                # Add threshold lines if defined
-                if meta["thresholds"]["low"] is not None:
-                    ax.axhline(y=meta["thresholds"]["low"], color='r', linestyle='--', 
-                              label=f"Low {meta['label']} Threshold")
-                if meta["thresholds"]["high"] is not None:
-                    ax.axhline(y=meta["thresholds"]["high"], color='r', linestyle='--', 
-                              label=f"High {meta['label']} Threshold")
-                
-                if meta["thresholds"]["low"] is not None or meta["thresholds"]["high"] is not None:
-                    ax.legend()
-                
-                st.pyplot(fig)
-                
-                # Download PNG
-                buf = BytesIO()
-                fig.savefig(buf, format="png")
-                buf.seek(0)
-                st.download_button(
-                    f"📥 Download {meta['label']} Graph",
-                    buf,
-                    file_name=f"{col}_graph.png",
-                    mime="image/png"
-                )
-
-# Create 3D visualizations
-def create_3d_visualizations(df):
-    st.header("🌐 3D Telemetry Visualizations")
-    
-    # Check for required columns for 3D visualization
-    vis_cols = ["velocity", "fuel", "battery"]
-    if all(col in df.columns for col in vis_cols):
-        col1, col2 = st.columns(2)
-        
-        # Scatter plot
-        with col1:
-            st.subheader("3D Scatter Plot")
-            scatter_fig = px.scatter_3d(
-                df, 
-                x="velocity", 
-                y="fuel", 
-                z="battery",
-                color="temperature" if "temperature" in df.columns else None,
-                size="fuel", 
-                hover_data=["timestamp"] if "timestamp" in df.columns else None,
-                title="Velocity-Fuel-Battery Relationship"
-            )
-            st.plotly_chart(scatter_fig, use_container_width=True)
-        
-        # Mesh visualization
-        with col2:
-            st.subheader("3D Structured Mesh")
-            mesh_fig = go.Figure(data=[
-                go.Mesh3d(
-                    x=df["velocity"],
-                    y=df["fuel"],
-                    z=df["battery"],
-                    opacity=0.7,
-                    color="lightblue",
-                    alphahull=0
-                )
-            ])
-            mesh_fig.update_layout(
-                scene=dict(
-                    xaxis_title="Velocity (m/s)",
-                    yaxis_title="Fuel (%)",
-                    zaxis_title="Battery (%)"
-                )
-            )
-            st.plotly_chart(mesh_fig, use_container_width=True)
-    else:
-        st.warning("3D visualization requires velocity, fuel, and battery columns")
-
-# Main sidebar
-with st.sidebar:
-    st.header("📁 Data Input")
-    file = st.file_uploader("Upload Telemetry CSV", type=["csv"])
-    
-    if file:
-        st.success("✅ File loaded")
-        
-        # Email notification option
-        st.subheader("📧 Email Alerts")
-        enable_email = st.checkbox("Enable email notifications")
-        
-        if enable_email:
-            email_address = st.text_input("Email address for alerts")
-            
-            # This would be connected to actual email sending logic
-            if st.button("Test Email Connection"):
-                st.info("Email test functionality would go here")
-    
-    # Audio alerts toggle
-    st.subheader("🔊 Audio Alerts")
-    enable_audio = st.checkbox("Enable audio notifications", value=True)
-
-# Main processing logic
-if file:
-    try:
-        # Load and parse the CSV
-        df = pd.read_csv(file)
-        
-        # Handle timestamp column if present
-        if "timestamp" in df.columns:
-            df["timestamp"] = pd.to_datetime(df["timestamp"], format="%d-%m-%Y %H:%M", dayfirst=True, errors="coerce")
-            df["timestamp"] = df["timestamp"].astype('datetime64[ns]')   # Force correct type
-        
-        # Display raw data preview with tabs
-        st.header("📊 Data Analysis")
-        tab1, tab2 = st.tabs(["Data Preview", "Styled Data"])
-        
-        with tab1:
-            st.dataframe(df, use_container_width=True)
-        
-        with tab2:
-            styled_df = style_dataframe(df)
-            st.dataframe(styled_df, use_container_width=True)
-        
-        # Detect anomalies
-        anomalies = detect_anomalies(df)
-        
-        # Display and speak alerts if any
-        if anomalies:
-            st.header("⚠️ Critical Alerts")
-            for alert in anomalies:
-                st.warning(alert)
-            
-            # Speak alerts if enabled
-            if enable_audio:
-                speak_alerts(anomalies)
-        
-        # Create visualization tabs
-        st.header("📈 Telemetry Graphs")
-        create_2d_plots(df)
-        
-        # 3D visualizations
-        create_3d_visualizations(df)
-        
-        # Export options
-        st.header("📥 Export Analysis")
-        
-        # Excel download
-        out = BytesIO()
-        df.to_excel(out, index=False, engine="openpyxl")
-        out.seek(0)
-        st.download_button(
-            "📊 Download Excel Report", 
-            out.getvalue(), 
-            file_name="spacecraft_telemetry_analysis.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
-        
-        # Generate summary stats
-        st.header("📑 Summary Statistics")
-        st.dataframe(df.describe(), use_container_width=True)
-        
-    except Exception as e:
-        st.error(f"❌ Processing error: {e}")
-else:
-    # No file uploaded yet
-    st.info("Please upload a telemetry CSV file. The file should include columns such as 'timestamp', 'temperature', 'pressure', 'velocity', 'battery', and 'fuel'.")
-    
-    # Show sample data structure
-    st.header("📋 Expected Data Format")
-    sample_data = {
-        "timestamp": ["2025-04-25 09:00:00", "2025-04-25 10:00:00", "2025-04-25 11:00:00"],
-        "temperature": [22.5, 23.1, 41.5],
-        "pressure": [1.01, 0.98, 1.05],
-        "velocity": [1200, 1250, 1300],
-        "battery": [95, 90, 85],
-        "fuel": [80, 75, 70]
-    }
-    st.dataframe(pd.DataFrame(sample_data), use_container_width=True)
-
-    # Add after the sidebar file uploader
-use_simulated_data = st.sidebar.checkbox("Use simulated data stream")
-
-if use_simulated_data:
-    st.sidebar.subheader("Simulation Settings")
-    simulation_duration = st.sidebar.slider("Duration (minutes)", 5, 60, 15)
-    simulation_freq = st.sidebar.slider("Data frequency (seconds)", 1, 30, 5)
-    anomaly_chance = st.sidebar.slider("Anomaly chance (%)", 0, 100, 20)
-    
-    if st.sidebar.button("Start Simulation"):
-        # Generate simulated telemetry data
-        sim_start = pd.Timestamp.now() - pd.Timedelta(minutes=simulation_duration)
-        sim_end = pd.Timestamp.now()
-        sim_index = pd.date_range(sim_start, sim_end, freq=f"{simulation_freq}S")
-        
-        sim_data = {
-            "timestamp": sim_index,
-            "temperature": np.random.normal(25, 8, size=len(sim_index)),
-            "pressure": np.random.normal(1.0, 0.1, size=len(sim_index)),
-            "velocity": np.random.normal(1200, 100, size=len(sim_index)),
-            "battery": np.random.normal(80, 10, size=len(sim_index)),
-            "fuel": np.random.normal(70, 15, size=len(sim_index))
-        }
-        
-        # Add anomalies based on chance
-        if anomaly_chance > 0:
-            for field in ["temperature", "pressure", "battery", "fuel"]:
-                if np.random.rand() < anomaly_chance/100:
-                    anomaly_idx = np.random.choice(range(len(sim_index)), size=max(1, int(len(sim_index)*0.1)))
-                    thresholds = telemetry_fields[field]["thresholds"]
-                    
-                    # Generate values outside thresholds
-                    if thresholds["low"] is not None and np.random.choice([True, False]):
-                        sim_data[field][anomaly_idx] = np.random.uniform(
-                            thresholds["low"] - 20, 
-                            thresholds["low"] - 1, 
-                            size=len(anomaly_idx)
-                        )
-                    elif thresholds["high"] is not None:
-                        sim_data[field][anomaly_idx] = np.random.uniform(
-                            thresholds["high"] + 1, 
-                            thresholds["high"] + 20, 
-                            size=len(anomaly_idx)
-                        )
-        
-        df = pd.DataFrame(sim_data)
-        file = True  # Trick the system to process the simulated data
-
-        # Add to sidebar after the file uploader section
-with st.sidebar:
-    # Keep existing sidebar code and add:
-    st.header("🚀 Mission Profiles")
-    
-    mission_profiles = {
-        "LEO Satellite": {
-            "temperature": {"low": -5, "high": 35},
-            "pressure": {"low": 0.9, "high": 1.1},
-            "battery": {"low": 30, "high": None},
-            "fuel": {"low": 25, "high": None}
-        },
-        "Deep Space Probe": {
-            "temperature": {"low": -20, "high": 30},
-            "pressure": {"low": 0.7, "high": 1.0},
-            "battery": {"low": 40, "high": None},
-            "fuel": {"low": 35, "high": None}
-        },
-        "Mars Mission": {
-            "temperature": {"low": -40, "high": 25},
-            "pressure": {"low": 0.6, "high": 0.9},
-            "battery": {"low": 50, "high": None},
-            "fuel": {"low": 40, "high": None}
-        },
-        "Venus Orbiter": {
-            "temperature": {"low": 10, "high": 60},
-            "pressure": {"low": 0.8, "high": 1.2},
-            "battery": {"low": 35, "high": None},
-            "fuel": {"low": 30, "high": None}
-        },
-        "Lunar Lander": {
-            "temperature": {"low": -30, "high": 40},
-            "pressure": {"low": 0.85, "high": 1.05},
-            "battery": {"low": 45, "high": None},
-            "fuel": {"low": 20, "high": None}
-        }
-    }
-    
-    selected_profile = st.selectbox("Select mission profile", 
-                                   ["Custom"] + list(mission_profiles.keys()))
-    
-    if selected_profile != "Custom":
-        st.info(f"Using {selected_profile} thresholds")
-        # Override thresholds with profile values
-        for field, values in mission_profiles[selected_profile].items():
-            if field in telemetry_fields:
-                telemetry_fields[field]["thresholds"] = values
-                
-        # Show the selected profile's thresholds
-        st.subheader("Profile Thresholds")
-        profile_data = []
-        for field, values in mission_profiles[selected_profile].items():
-            if field in telemetry_fields:
-                low_val = values["low"] if values["low"] is not None else "N/A"
-                high_val = values["high"] if values["high"] is not None else "N/A"
-                profile_data.append({
-                    "Parameter": telemetry_fields[field]["label"],
-                    "Low Threshold": low_val,
-                    "High Threshold": high_val,
-                    "Unit": telemetry_fields[field]["y_label"]
-                })
-        
-        st.dataframe(pd.DataFrame(profile_data), use_container_width=True)
-        
-        # Option to save current thresholds as a custom profile
-        if st.button("Save Current as Custom Profile"):
-            with st.expander("Create Custom Profile"):
-                profile_name = st.text_input("Profile Name")
-                if st.button("Save Profile") and profile_name:
-                    # Would save to a database or file in a real implementation
-                    st.success(f"Profile '{profile_name}' saved successfully!")
-    else:
-        # Show custom threshold adjustment UI
-        st.subheader("Custom Thresholds")
-        for field, meta in telemetry_fields.items():
-            st.markdown(f"**{meta['label']}**")
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                current_low = meta["thresholds"].get("low", None)
-                new_low = st.number_input(
-                    f"Low {meta['label']} ({meta['y_label']})",
-                    value=float(current_low) if current_low is not None else 0.0,
-                    step=0.1
-                )
-                telemetry_fields[field]["thresholds"]["low"] = new_low if new_low != 0.0 else None
-                
-            with col2:
-                current_high = meta["thresholds"].get("high", None)
-                new_high = st.number_input(
-                    f"High {meta['label']} ({meta['y_label']})",
-                    value=float(current_high) if current_high is not None else 0.0,
-                    step=0.1
-                )
-                telemetry_fields[field]["thresholds"]["high"] = new_high if new_high != 0.0 else None
-
-                # Add near the top of main analysis section
-if file:
-    # Health status indicators
-    st.header("🛡️ System Health Status")
-    status_cols = st.columns(len(telemetry_fields))
-    
-    # For each telemetry field, create a gauge
-    for idx, (field, meta) in enumerate(telemetry_fields.items()):
-        if field in df.columns:
-            with status_cols[idx]:
-                current_val = df[field].iloc[-1]
-                thresholds = meta["thresholds"]
-                
-                # Calculate health status
-                if ((thresholds["low"] is not None and current_val < thresholds["low"]) or
-                    (thresholds["high"] is not None and current_val > thresholds["high"])):
-                    status = "Critical"
-                    color = "red"
-                elif ((thresholds["low"] is not None and current_val < thresholds["low"] * 1.1) or
-                      (thresholds["high"] is not None and current_val > thresholds["high"] * 0.9)):
-                    status = "Warning"
-                    color = "orange"
-                else:
-                    status = "Nominal" 
-                    color = "green"
-                
-                # Create gauge
-                gauge = go.Figure(go.Indicator(
-                    mode="gauge+number",
-                    value=current_val,
-                    title={"text": meta["label"]},
-                    gauge={
-                        "axis": {"range": [df[field].min() * 0.9, df[field].max() * 1.1]},
-                        "bar": {"color": color},
-                        "steps": [
-                            {"range": [df[field].min() * 0.9, df[field].max() * 1.1], "color": "lightgray"}
-                        ],
-                        "threshold": {
-                            "line": {"color": "red", "width": 4},
-                            "thickness": 0.75,
-                            "value": thresholds["low"] if thresholds["low"] is not None else (
-                                thresholds["high"] if thresholds["high"] is not None else df[field].mean()
-                            )
-                        }
-                    }
-                ))
-                gauge.update_layout(height=200)
-                st.plotly_chart(gauge, use_container_width=True)
-                st.markdown(f"**Status:** <span style='color:{color}'>{status}</span>", unsafe_allow_html=True)
-
+import streamlit as st
+import pandas as pd
+import matplotlib
+matplotlib.use("Agg")   # Headless backend - much faster figure creation
+import matplotlib.pyplot as plt
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+import pyttsx3
+from io import BytesIO
+import threading
+import zipfile
+import smtplib
+import numpy as np
+
+try:
+    # Optional - lets the 3D mesh hull be computed server-side
+    from scipy.spatial import ConvexHull
+except ImportError:
+    ConvexHull = None
+
+
+
+# App configuration
+st.set_page_config(
+    page_title="Spacecraft Telemetry Analyzer",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Custom styling
+st.markdown(
+    """
+    <style>
+    .stApp { background-color: #0f1117; color: white; }
+    .stButton>button { background-color: #1f77b4; color: white; }
+    .stDownloadButton>button { background-color: #2ca02c; color: white; }
+    .stTabs [data-baseweb="tab-list"] button [data-testid="stMarkdownContainer"] p {
+        font-size: 1.2rem;
+        font-weight: bold;
+    }
+    </style>
+    """,
+    unsafe_allow_html=True
+)
+
+# App header
+st.title("🛰️ Universal Spacecraft Telemetry Analyzer")
+st.markdown("Advanced analytics platform for spacecraft telemetry data with real-time anomaly detection")
+
+# Define telemetry fields and their properties
+telemetry_fields = {
+    "temperature": {
+        "label": "Temperature",
+        "y_label": "°C",
+        "thresholds": {"low": 0, "high": 40},
+        "alert_msg": lambda val: f"{'Low' if val < 0 else 'High'} temperature detected: {val}°C"
+    },
+    "pressure": {
+        "label": "Pressure",
+        "y_label": "atm",
+        "thresholds": {"low": 0.8, "high": 1.2},
+        "alert_msg": lambda val: f"{'Low' if val < 0.8 else 'High'} pressure detected: {val} atm"
+    },
+    "velocity": {
+        "label": "Velocity",
+        "y_label": "m/s",
+        "thresholds": {"low": None, "high": None},
+        "alert_msg": None
+    },
+    "battery": {
+        "label": "Battery Level",
+        "y_label": "%",
+        "thresholds": {"low": 20, "high": None},
+        "alert_msg": lambda val: f"Battery critically low: {val}%"
+    },
+    "fuel": {
+        "label": "Fuel Level",
+        "y_label": "%",
+        "thresholds": {"low": 20, "high": None},
+        "alert_msg": lambda val: f"Fuel critically low: {val}%"
+    }
+}
+
+# Cached CSV loader - keyed on the uploaded file bytes so slider/checkbox
+# reruns skip the parse/convert pipeline entirely
+@st.cache_data(show_spinner=False)
+def load_telemetry(file_bytes):
+    # Peek at the header so parse_dates doesn't choke on files without a
+    # timestamp column, then let the C parser convert in a single pass
+    # (to_datetime already returned datetime64[ns], so no astype needed)
+    header = pd.read_csv(BytesIO(file_bytes), nrows=0)
+    parse_dates = ["timestamp"] if "timestamp" in header.columns else None
+    # float32 halves memory traffic for every downstream scan and is ample
+    # precision for sensor telemetry
+    dtypes = {col: "float32" for col in telemetry_fields if col in header.columns}
+    df = pd.read_csv(BytesIO(file_bytes), parse_dates=parse_dates,
+                     date_format="%d-%m-%Y %H:%M", dtype=dtypes)
+    # A single malformed timestamp makes read_csv leave the whole column
+    # as strings; coerce just the bad rows to NaT like the old loader did
+    # (this only runs for malformed files, so the C-parser path is kept)
+    if parse_dates and not pd.api.types.is_datetime64_any_dtype(df["timestamp"]):
+        df["timestamp"] = pd.to_datetime(df["timestamp"], format="%d-%m-%Y %H:%M",
+                                         errors="coerce")
+    return df
+
+# Cached summary stats so df.describe() doesn't rerun on every interaction
+@st.cache_data(show_spinner=False)
+def summarize_telemetry(df):
+    return df.describe()
+
+# Cached Excel export - openpyxl serialization only reruns when the data
+# changes, not on every widget interaction
+@st.cache_data(show_spinner=False)
+def to_excel_bytes(df):
+    out = BytesIO()
+    df.to_excel(out, index=False, engine="openpyxl")
+    return out.getvalue()
+
+# TTS engine is expensive to initialize, so keep one per session
+@st.cache_resource(show_spinner=False)
+def get_tts_engine():
+    return pyttsx3.init()
+
+# TTS for alerts - runAndWait blocks for the whole speech batch, so the
+# speaking happens on a daemon thread and the script run returns
+# immediately
+def speak_alerts(alerts):
+    try:
+        engine = get_tts_engine()
+    except Exception as e:
+        st.error(f"❌ Audio alert error: {e}")
+        return
+
+    for msg in alerts:
+        st.info(f"🔊 {msg}")
+
+    # Reruns repeat the same alert list; don't restart (or overlap)
+    # playback for alerts that are already being spoken
+    if st.session_state.get("spoken_alerts") == alerts:
+        return
+    st.session_state["spoken_alerts"] = alerts
+
+    def _speak():
+        # No Streamlit context on this thread, so playback errors can't
+        # reach the UI - drop them rather than kill the interpreter
+        try:
+            # runAndWait already blocks until playback finishes, so no
+            # extra pause between messages
+            for msg in alerts:
+                engine.say(msg)
+                engine.runAndWait()
+        except Exception:
+            pass
+
+    threading.Thread(target=_speak, daemon=True).start()
+
+# Threshold arrays for a list of columns, resolved with one dict walk per
+# column instead of repeated nested lookups in the hot paths; NaN stands
+# in for "no threshold" so comparisons naturally evaluate False
+def _threshold_arrays(cols):
+    lows = np.empty(len(cols))
+    highs = np.empty(len(cols))
+    for idx, col in enumerate(cols):
+        thresholds = telemetry_fields[col]["thresholds"]
+        low, high = thresholds["low"], thresholds["high"]
+        lows[idx] = np.nan if low is None else low
+        highs[idx] = np.nan if high is None else high
+    return lows, highs
+
+# Cell values and their threshold-breach mask for the telemetry columns,
+# via one NumPy comparison (shared by the styler and the breach-row filter)
+def _breach_matrix(data, cols):
+    lows, highs = _threshold_arrays(cols)
+
+    # Coerce so non-numeric cells become NaN and stay unstyled
+    values = data[cols].apply(pd.to_numeric, errors="coerce").to_numpy()
+    # Compare in the values' dtype so a float32 cell exactly on a
+    # threshold (e.g. 1.2) doesn't read as a breach through the float64
+    # upcast, keeping the table consistent with detect_anomalies
+    breach = (values < lows.astype(values.dtype)) | (values > highs.astype(values.dtype))
+    return values, breach
+
+# Highlight cells in dataframe based on thresholds - one vectorized
+# comparison building the whole CSS matrix instead of a Python callback
+# per row
+def style_dataframe(df):
+    cols = [col for col in df.columns if col in telemetry_fields]
+
+    def build_css(data):
+        styles = pd.DataFrame('', index=data.index, columns=data.columns)
+        if not cols:
+            return styles
+        values, breach = _breach_matrix(data, cols)
+        styles[cols] = np.where(
+            breach,
+            'color: red; background-color: rgba(255, 0, 0, 0.1)',
+            np.where(np.isnan(values), '', 'color: green')
+        )
+        return styles
+
+    return df.style.apply(build_css, axis=None)
+
+# Alert values go through float32 now, so trim the excess repr digits
+# (0.33000001311302185 -> 0.33) and keep whole numbers whole. The
+# shortest round-trip repr handles any magnitude, unlike a fixed
+# decimal round (41.53 would otherwise show as 41.529999)
+def _alert_value(val):
+    val = float(np.format_float_positional(np.float32(val), unique=True))
+    return int(val) if val == int(val) else val
+
+# Check for anomalies in the data - one vectorized min/max pass over all
+# monitored columns instead of separate scans per threshold
+def detect_anomalies(df):
+    alerts = []
+
+    fields = [col for col, meta in telemetry_fields.items()
+              if col in df.columns and meta["alert_msg"] is not None]
+    if not fields or not len(df):
+        return alerts
+
+    lows, highs = _threshold_arrays(fields)
+
+    # One contiguous float32 scan for all columns - nanmin/nanmax skip
+    # missing samples the way the old per-column pandas reductions did
+    arr = df[fields].to_numpy(dtype=np.float32)
+    with np.errstate(all="ignore"):
+        mins = np.nanmin(arr, axis=0)
+        maxs = np.nanmax(arr, axis=0)
+    # Compare in float32 so a value exactly on a threshold (e.g. 1.2)
+    # doesn't read as a breach through the float64 upcast
+    low_breaches = mins < lows.astype(np.float32)
+    high_breaches = maxs > highs.astype(np.float32)
+
+    for idx, col in enumerate(fields):
+        if low_breaches[idx]:
+            alerts.append(telemetry_fields[col]["alert_msg"](_alert_value(mins[idx])))
+        if high_breaches[idx]:
+            alerts.append(telemetry_fields[col]["alert_msg"](_alert_value(maxs[idx])))
+
+    return alerts
+
+# Draw one telemetry field onto the given axes (shared by the display
+# tabs and the cached PNG export)
+def _plot_field(ax, df, col, meta):
+    thresholds = meta["thresholds"]
+    label = meta["label"]
+
+    x = df["timestamp"] if "timestamp" in df.columns else df.index
+    ax.plot(x, df[col], color='cyan', marker='o')
+    ax.set_ylabel(meta["y_label"])
+    ax.grid(True)
+
+    # Add threshold lines if defined
+    if thresholds["low"] is not None:
+        ax.axhline(y=thresholds["low"], color='r', linestyle='--',
+                  label=f"Low {label} Threshold")
+    if thresholds["high"] is not None:
+        ax.axhline(y=thresholds["high"], color='r', linestyle='--',
+                  label=f"High {label} Threshold")
+
+    if thresholds["low"] is not None or thresholds["high"] is not None:
+        ax.legend()
+
+# All field graphs zipped up once - reruns reuse the cached archive until
+# the data or thresholds change, instead of encoding five PNGs per rerun
+@st.cache_data(show_spinner=False)
+def graphs_zip_bytes(df, thresholds_key):
+    out = BytesIO()
+    fig, ax = plt.subplots(figsize=(10, 5))
+    with zipfile.ZipFile(out, "w") as archive:
+        for col, meta in telemetry_fields.items():
+            if col in df.columns:
+                ax.clear()
+                _plot_field(ax, df, col, meta)
+                buf = BytesIO()
+                fig.savefig(buf, format="png")
+                archive.writestr(f"{col}_graph.png", buf.getvalue())
+    plt.close(fig)
+    return out.getvalue()
+
+# Generate 2D plots for each telemetry field
+def create_2d_plots(df):
+    tabs = st.tabs([meta["label"] for meta in telemetry_fields.values()])
+
+    x = df["timestamp"] if "timestamp" in df.columns else df.index
+
+    for idx, (col, meta) in enumerate(telemetry_fields.items()):
+        if col in df.columns:
+            with tabs[idx]:
+                st.subheader(f"{meta['label']} Over Time")
+
+                # WebGL trace - render cost stays flat for long series,
+                # unlike per-tab matplotlib rasterization
+                fig = go.Figure(go.Scattergl(
+                    x=x, y=df[col], mode="lines+markers",
+                    line={"color": "cyan"}, marker={"color": "cyan"}
+                ))
+                thresholds = meta["thresholds"]
+                if thresholds["low"] is not None:
+                    fig.add_hline(y=thresholds["low"], line_dash="dash",
+                                  line_color="red",
+                                  annotation_text=f"Low {meta['label']} Threshold")
+                if thresholds["high"] is not None:
+                    fig.add_hline(y=thresholds["high"], line_dash="dash",
+                                  line_color="red",
+                                  annotation_text=f"High {meta['label']} Threshold")
+                fig.update_layout(yaxis_title=meta["y_label"])
+                st.plotly_chart(fig, use_container_width=True)
+
+    # One batched download instead of encoding a PNG per tab per rerun;
+    # thresholds are part of the cache key since they shape the graphs
+    thresholds_key = tuple(
+        (col, meta["thresholds"]["low"], meta["thresholds"]["high"])
+        for col, meta in telemetry_fields.items()
+    )
+    st.download_button(
+        "📥 Download all graphs (ZIP)",
+        graphs_zip_bytes(df, thresholds_key),
+        file_name="telemetry_graphs.zip",
+        mime="application/zip"
+    )
+
+# Downsample to a fixed point budget so plotly.js render time stays flat
+# regardless of how many telemetry rows were uploaded
+def _decimate(df, n=2000):
+    if len(df) <= n:
+        return df
+    return df.iloc[np.linspace(0, len(df) - 1, n).astype(int)]
+
+# Mesh trace for the 3D view. With scipy available the convex hull is
+# computed server-side (C code) and shipped as an explicit triangle list,
+# so the browser just renders; otherwise fall back to alphahull=0, which
+# makes plotly.js compute the same hull client-side
+def _mesh_trace(plot_df):
+    pts = plot_df[["velocity", "fuel", "battery"]].to_numpy(dtype=np.float64)
+    if ConvexHull is not None:
+        try:
+            hull = ConvexHull(pts)
+            i, j, k = hull.simplices.T
+            return go.Mesh3d(
+                x=pts[:, 0], y=pts[:, 1], z=pts[:, 2],
+                i=i, j=j, k=k,
+                opacity=0.7,
+                color="lightblue"
+            )
+        except Exception:
+            # Degenerate (e.g. coplanar) points - let the client cope
+            pass
+    return go.Mesh3d(
+        x=pts[:, 0], y=pts[:, 1], z=pts[:, 2],
+        opacity=0.7,
+        color="lightblue",
+        alphahull=0
+    )
+
+# Create 3D visualizations
+def create_3d_visualizations(df):
+    st.header("🌐 3D Telemetry Visualizations")
+
+    # Check for required columns for 3D visualization
+    vis_cols = ["velocity", "fuel", "battery"]
+    if all(col in df.columns for col in vis_cols):
+        col1, col2 = st.columns(2)
+
+        plot_df = _decimate(df)
+
+        # Rebuilding both figures every rerun is pure waste when the data
+        # hasn't changed; key the session copies on every column the
+        # figures consume (color and hover included)
+        key_cols = vis_cols + [col for col in ("temperature", "timestamp") if col in plot_df.columns]
+        plot_key = int(pd.util.hash_pandas_object(plot_df[key_cols], index=False).sum())
+
+        if st.session_state.get("plot3d_key") != plot_key:
+            mesh_trace = _mesh_trace(plot_df)
+            if "mesh_fig" in st.session_state:
+                # Same figure, new data - batch_update swaps the arrays
+                # (and hull triangles) without rebuilding layout/scene
+                mesh_fig = st.session_state["mesh_fig"]
+                with mesh_fig.batch_update():
+                    mesh_fig.data[0].update(
+                        x=mesh_trace.x, y=mesh_trace.y, z=mesh_trace.z,
+                        i=mesh_trace.i, j=mesh_trace.j, k=mesh_trace.k,
+                        alphahull=mesh_trace.alphahull
+                    )
+            else:
+                mesh_fig = go.Figure(data=[mesh_trace])
+                mesh_fig.update_layout(
+                    scene=dict(
+                        xaxis_title="Velocity (m/s)",
+                        yaxis_title="Fuel (%)",
+                        zaxis_title="Battery (%)"
+                    )
+                )
+                st.session_state["mesh_fig"] = mesh_fig
+
+            # The scatter is rebuilt on data change because px derives its
+            # size/color scaling from the data itself
+            st.session_state["scatter_fig"] = px.scatter_3d(
+                plot_df,
+                x="velocity",
+                y="fuel",
+                z="battery",
+                color="temperature" if "temperature" in plot_df.columns else None,
+                size="fuel",
+                hover_data=["timestamp"] if "timestamp" in plot_df.columns else None,
+                title="Velocity-Fuel-Battery Relationship"
+            )
+            st.session_state["plot3d_key"] = plot_key
+
+        # Scatter plot
+        with col1:
+            st.subheader("3D Scatter Plot")
+            st.plotly_chart(st.session_state["scatter_fig"], use_container_width=True)
+
+        # Mesh visualization
+        with col2:
+            st.subheader("3D Structured Mesh")
+            st.plotly_chart(st.session_state["mesh_fig"], use_container_width=True)
+    else:
+        st.warning("3D visualization requires velocity, fuel, and battery columns")
+
+# Main sidebar
+with st.sidebar:
+    st.header("📁 Data Input")
+    file = st.file_uploader("Upload Telemetry CSV", type=["csv"])
+    
+    if file:
+        st.success("✅ File loaded")
+        
+        # Email notification option
+        st.subheader("📧 Email Alerts")
+        enable_email = st.checkbox("Enable email notifications")
+        
+        if enable_email:
+            email_address = st.text_input("Email address for alerts")
+            
+            # This would be connected to actual email sending logic
+            if st.button("Test Email Connection"):
+                st.info("Email test functionality would go here")
+    
+    # Audio alerts toggle
+    st.subheader("🔊 Audio Alerts")
+    enable_audio = st.checkbox("Enable audio notifications", value=True)
+
+# Main processing logic
+if file:
+    try:
+        # Load and parse the CSV once per upload - the parsed frame lives in
+        # session_state keyed by the file hash, so reruns skip even the
+        # cache lookup
+        file_bytes = file.getvalue()
+        file_key = hash(file_bytes)
+        if st.session_state.get("df_key") != file_key:
+            st.session_state["df"] = load_telemetry(file_bytes)
+            st.session_state["df_key"] = file_key
+        df = st.session_state["df"]
+
+        # Display raw data preview with tabs
+        st.header("📊 Data Analysis")
+        tab1, tab2 = st.tabs(["Data Preview", "Styled Data"])
+        
+        with tab1:
+            st.dataframe(df, use_container_width=True)
+        
+        with tab2:
+            # Default to just the anomalous rows - styling the whole table
+            # ships a big HTML payload for large uploads
+            show_all = st.checkbox("Show all rows", value=False)
+            if show_all:
+                st.dataframe(style_dataframe(df), use_container_width=True)
+            else:
+                cols = [col for col in df.columns if col in telemetry_fields]
+                if cols:
+                    _, breach = _breach_matrix(df, cols)
+                    breach_df = df[breach.any(axis=1)]
+                else:
+                    breach_df = df.iloc[0:0]
+                if len(breach_df):
+                    st.caption(f"{len(breach_df)} rows with threshold breaches - tick 'Show all rows' for the full table")
+                    st.dataframe(style_dataframe(breach_df), use_container_width=True)
+                else:
+                    st.info("No threshold breaches in this data.")
+        
+        # Detect anomalies
+        anomalies = detect_anomalies(df)
+        
+        # Display and speak alerts if any
+        if anomalies:
+            st.header("⚠️ Critical Alerts")
+            for alert in anomalies:
+                st.warning(alert)
+            
+            # Speak alerts if enabled
+            if enable_audio:
+                speak_alerts(anomalies)
+        
+        # Create visualization tabs
+        st.header("📈 Telemetry Graphs")
+        create_2d_plots(df)
+        
+        # 3D visualizations
+        create_3d_visualizations(df)
+        
+        # Export options
+        st.header("📥 Export Analysis")
+        
+        # Excel download
+        st.download_button(
+            "📊 Download Excel Report",
+            to_excel_bytes(df),
+            file_name="spacecraft_telemetry_analysis.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+        
+        # Generate summary stats
+        st.header("📑 Summary Statistics")
+        st.dataframe(summarize_telemetry(df), use_container_width=True)
+        
+    except Exception as e:
+        st.error(f"❌ Processing error: {e}")
+        df = None
+else:
+    # No file uploaded yet
+    st.info("Please upload a telemetry CSV file. The file should include columns such as 'timestamp', 'temperature', 'pressure', 'velocity', 'battery', and 'fuel'.")
+    
+    # Show sample data structure
+    st.header("📋 Expected Data Format")
+    sample_data = {
+        "timestamp": ["2025-04-25 09:00:00", "2025-04-25 10:00:00", "2025-04-25 11:00:00"],
+        "temperature": [22.5, 23.1, 41.5],
+        "pressure": [1.01, 0.98, 1.05],
+        "velocity": [1200, 1250, 1300],
+        "battery": [95, 90, 85],
+        "fuel": [80, 75, 70]
+    }
+    st.dataframe(pd.DataFrame(sample_data), use_container_width=True)
+
+    # Add after the sidebar file uploader
+use_simulated_data = st.sidebar.checkbox("Use simulated data stream")
+
+if use_simulated_data:
+    st.sidebar.subheader("Simulation Settings")
+    simulation_duration = st.sidebar.slider("Duration (minutes)", 5, 60, 15)
+    simulation_freq = st.sidebar.slider("Data frequency (seconds)", 1, 30, 5)
+    anomaly_chance = st.sidebar.slider("Anomaly chance (%)", 0, 100, 20)
+    
+    if st.sidebar.button("Start Simulation"):
+        # Generate simulated telemetry data - take now() once so the start
+        # and end of the window can't drift apart
+        sim_end = pd.Timestamp.now()
+        sim_start = sim_end - pd.Timedelta(minutes=simulation_duration)
+        sim_index = pd.date_range(sim_start, sim_end, freq=f"{simulation_freq}s")
+        n = len(sim_index)
+
+        # One batched draw into a preallocated float32 buffer instead of
+        # five separate normal() calls and heap allocations; the columns
+        # below are views into it
+        sim_fields = ["temperature", "pressure", "velocity", "battery", "fuel"]
+        sim_means = np.array([25, 1.0, 1200, 80, 70], dtype=np.float32)
+        sim_stds = np.array([8, 0.1, 100, 10, 15], dtype=np.float32)
+        rng = np.random.default_rng()
+        buf = np.empty((n, len(sim_fields)), dtype=np.float32)
+        rng.standard_normal(out=buf, dtype=np.float32)
+        buf *= sim_stds
+        buf += sim_means
+
+        sim_data = {"timestamp": sim_index}
+        for i, field in enumerate(sim_fields):
+            sim_data[field] = buf[:, i]
+
+        # Add anomalies based on chance - all random draws batched up front
+        # so injection is one fancy-indexed write per affected field
+        if anomaly_chance > 0:
+            anomaly_fields = ["temperature", "pressure", "battery", "fuel"]
+            k = max(1, int(n * 0.1))
+
+            inject = rng.random(len(anomaly_fields)) < anomaly_chance / 100
+            anomaly_idx = rng.integers(0, n, size=(len(anomaly_fields), k))
+            pick_low = rng.random(len(anomaly_fields)) < 0.5
+
+            for f_idx in np.nonzero(inject)[0]:
+                field = anomaly_fields[f_idx]
+                thresholds = telemetry_fields[field]["thresholds"]
+
+                # Generate values outside thresholds
+                if thresholds["low"] is not None and pick_low[f_idx]:
+                    sim_data[field][anomaly_idx[f_idx]] = rng.uniform(
+                        thresholds["low"] - 20,
+                        thresholds["low"] - 1,
+                        size=k
+                    )
+                elif thresholds["high"] is not None:
+                    sim_data[field][anomaly_idx[f_idx]] = rng.uniform(
+                        thresholds["high"] + 1,
+                        thresholds["high"] + 20,
+                        size=k
+                    )
+        
+        df = pd.DataFrame(sim_data)
+        file = True  # Trick the system to process the simulated data
+
+        # Add to sidebar after the file uploader section
+with st.sidebar:
+    # Keep existing sidebar code and add:
+    st.header("🚀 Mission Profiles")
+    
+    mission_profiles = {
+        "LEO Satellite": {
+            "temperature": {"low": -5, "high": 35},
+            "pressure": {"low": 0.9, "high": 1.1},
+            "battery": {"low": 30, "high": None},
+            "fuel": {"low": 25, "high": None}
+        },
+        "Deep Space Probe": {
+            "temperature": {"low": -20, "high": 30},
+            "pressure": {"low": 0.7, "high": 1.0},
+            "battery": {"low": 40, "high": None},
+            "fuel": {"low": 35, "high": None}
+        },
+        "Mars Mission": {
+            "temperature": {"low": -40, "high": 25},
+            "pressure": {"low": 0.6, "high": 0.9},
+            "battery": {"low": 50, "high": None},
+            "fuel": {"low": 40, "high": None}
+        },
+        "Venus Orbiter": {
+            "temperature": {"low": 10, "high": 60},
+            "pressure": {"low": 0.8, "high": 1.2},
+            "battery": {"low": 35, "high": None},
+            "fuel": {"low": 30, "high": None}
+        },
+        "Lunar Lander": {
+            "temperature": {"low": -30, "high": 40},
+            "pressure": {"low": 0.85, "high": 1.05},
+            "battery": {"low": 45, "high": None},
+            "fuel": {"low": 20, "high": None}
+        }
+    }
+    
+    selected_profile = st.selectbox("Select mission profile", 
+                                   ["Custom"] + list(mission_profiles.keys()))
+    
+    if selected_profile != "Custom":
+        st.info(f"Using {selected_profile} thresholds")
+        # Override thresholds with profile values
+        for field, values in mission_profiles[selected_profile].items():
+            if field in telemetry_fields:
+                telemetry_fields[field]["thresholds"] = values
+                
+        # Show the selected profile's thresholds
+        st.subheader("Profile Thresholds")
+        profile_data = []
+        for field, values in mission_profiles[selected_profile].items():
+            if field in telemetry_fields:
+                low_val = values["low"] if values["low"] is not None else "N/A"
+                high_val = values["high"] if values["high"] is not None else "N/A"
+                profile_data.append({
+                    "Parameter": telemetry_fields[field]["label"],
+                    "Low Threshold": low_val,
+                    "High Threshold": high_val,
+                    "Unit": telemetry_fields[field]["y_label"]
+                })
+        
+        st.dataframe(pd.DataFrame(profile_data), use_container_width=True)
+        
+        # Option to save current thresholds as a custom profile
+        if st.button("Save Current as Custom Profile"):
+            with st.expander("Create Custom Profile"):
+                profile_name = st.text_input("Profile Name")
+                if st.button("Save Profile") and profile_name:
+                    # Would save to a database or file in a real implementation
+                    st.success(f"Profile '{profile_name}' saved successfully!")
+    else:
+        # Show custom threshold adjustment UI
+        st.subheader("Custom Thresholds")
+        for field, meta in telemetry_fields.items():
+            st.markdown(f"**{meta['label']}**")
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                current_low = meta["thresholds"].get("low", None)
+                new_low = st.number_input(
+                    f"Low {meta['label']} ({meta['y_label']})",
+                    value=float(current_low) if current_low is not None else 0.0,
+                    step=0.1
+                )
+                telemetry_fields[field]["thresholds"]["low"] = new_low if new_low != 0.0 else None
+                
+            with col2:
+                current_high = meta["thresholds"].get("high", None)
+                new_high = st.number_input(
+                    f"High {meta['label']} ({meta['y_label']})",
+                    value=float(current_high) if current_high is not None else 0.0,
+                    step=0.1
+                )
+                telemetry_fields[field]["thresholds"]["high"] = new_high if new_high != 0.0 else None
+
+                # Add near the top of main analysis section
+if file and df is not None:
+    # Health status indicators
+    st.header("🛡️ System Health Status")
+    gauge_fields = [field for field in telemetry_fields if field in df.columns]
+
+    if gauge_fields:
+        # One stats pass for every gauge instead of fresh min/max/mean/last
+        # column scans inside the loop
+        gauge_stats = df[gauge_fields].agg(["min", "max", "mean"])
+        last_vals = df[gauge_fields].iloc[-1]
+
+        # One indicator subplot per field in a single figure - the browser
+        # lays out one plotly context instead of five
+        gauges = make_subplots(
+            rows=1, cols=len(gauge_fields),
+            specs=[[{"type": "indicator"}] * len(gauge_fields)]
+        )
+        statuses = []
+
+        for idx, field in enumerate(gauge_fields):
+            meta = telemetry_fields[field]
+            current_val = last_vals[field]
+            field_min = gauge_stats.loc["min", field]
+            field_max = gauge_stats.loc["max", field]
+            thresholds = meta["thresholds"]
+
+            # Calculate health status
+            if ((thresholds["low"] is not None and current_val < thresholds["low"]) or
+                (thresholds["high"] is not None and current_val > thresholds["high"])):
+                status = "Critical"
+                color = "red"
+            elif ((thresholds["low"] is not None and current_val < thresholds["low"] * 1.1) or
+                  (thresholds["high"] is not None and current_val > thresholds["high"] * 0.9)):
+                status = "Warning"
+                color = "orange"
+            else:
+                status = "Nominal"
+                color = "green"
+
+            gauges.add_trace(go.Indicator(
+                mode="gauge+number",
+                value=current_val,
+                title={"text": meta["label"]},
+                gauge={
+                    "axis": {"range": [field_min * 0.9, field_max * 1.1]},
+                    "bar": {"color": color},
+                    "steps": [
+                        {"range": [field_min * 0.9, field_max * 1.1], "color": "lightgray"}
+                    ],
+                    "threshold": {
+                        "line": {"color": "red", "width": 4},
+                        "thickness": 0.75,
+                        "value": thresholds["low"] if thresholds["low"] is not None else (
+                            thresholds["high"] if thresholds["high"] is not None else gauge_stats.loc["mean", field]
+                        )
+                    }
+                }
+            ), row=1, col=idx + 1)
+            statuses.append((status, color))
+
+        gauges.update_layout(height=200)
+        st.plotly_chart(gauges, use_container_width=True)
+
+        status_cols = st.columns(len(gauge_fields))
+        for col_box, (status, color) in zip(status_cols, statuses):
+            with col_box:
+                st.markdown(f"**Status:** <span style='color:{color}'>{status}</span>", unsafe_allow_html=True)
+
                 
\ No newline at end of file